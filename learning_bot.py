@@ -1,12 +1,24 @@
 import requests
 import time
-import json
+import orjson
 import os
 import re
 import hashlib
+import sqlite3
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from newspaper import Article
 import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # Optional: fall back to a requests thread pool
+    aiohttp = None
 
 malaysia_tz = pytz.timezone("Asia/Kuala_Lumpur")
 
@@ -20,6 +32,27 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 MAX_ARTICLES = 30  # Max number of articles to analyze and send
 
+# Fetch all keyword groups concurrently with aiohttp (falls back to a requests thread pool if not installed)
+USE_ASYNC_FETCH = True
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+NEWS_API_TIMEOUT = 30  # Seconds before a News API request is abandoned
+NEWS_API_RETRIES = 3  # Extra attempts on rate limits / server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+PROCESSED_DB_PATH = "processed_urls.db"  # Hashes of URLs already sent
+LEGACY_PROCESSED_PATH = "processed_urls.txt"  # Old plain-text history, imported once
+PROCESSED_URL_TTL_DAYS = 30  # Forget processed URLs older than this
+PROCESSED_DB_MAX_FREE_FRACTION = 0.25  # VACUUM once this share of database pages is unused
+
+TELEGRAM_MIN_INTERVAL = 1.0  # Minimum seconds between Telegram API calls (per-chat rate limit)
+
+FULL_ARTICLE_WORKERS = 16  # Threads used to download full article content
+MAX_CONTENT_CHARS = 2000  # Per-article body budget included in the Gemini prompt
+
+GEMINI_CACHE_DIR = "gemini_cache"  # Analyses keyed by prompt hash
+GEMINI_CACHE_TTL = 6 * 60 * 60  # Seconds a cached analysis stays valid
+
 # Model to use - options include: "gemini-2.0-flash", "gemini-2.0-pro", "gemini-1.5-flash", "gemini-1.5-pro"
 GEMINI_MODEL = "gemini-2.0-flash"
 
@@ -56,15 +89,83 @@ KEYWORD_GROUPS = [
     ],
 ]
 
+# Shared HTTP session: keep-alive connection pooling plus retries on rate limits / server errors.
+# raise_on_status=False hands the final response back so callers' status checks still run.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=["GET"],
+            raise_on_status=False,
+        ),
+    ),
+)
+# Telegram sends are POSTs and not idempotent: only retry 429, which means nothing was delivered
+_SESSION.mount(
+    "https://api.telegram.org/",
+    HTTPAdapter(
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429],
+            allowed_methods=["POST"],
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Markdown-to-HTML tokens used by send_to_telegram, matched in a single pass
+_MARKDOWN_RE = re.compile(
+    r"^#+ (?P<heading>.*?)$"
+    r"|\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>.*?)_"
+    r"|\[(?P<text>.*?)\]\((?P<href>.*?)\)",
+    re.M,
+)
+
 # ===== FUNCTIONS =====
 
 
 def load_processed_urls():
-    path = "processed_urls.txt"
+    """Read the legacy plain-text processed URL history"""
+    path = LEGACY_PROCESSED_PATH
     if not os.path.exists(path):
         return set()
-    with open(path, "r") as f:
-        return set(line.strip() for line in f.readlines())
+    with open(path, "r", buffering=1 << 20) as f:
+        return {line.rstrip("\n") for line in f}
+
+
+def url_digest(url):
+    """16-byte BLAKE2b fingerprint of a URL, used as the processed-URL key"""
+    return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+
+def open_processed_db():
+    """Open the processed URL database, importing the legacy text file if present"""
+    conn = sqlite3.connect(PROCESSED_DB_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS urls (hash BLOB PRIMARY KEY, ts INTEGER) WITHOUT ROWID"
+    )
+    if os.path.exists(LEGACY_PROCESSED_PATH):
+        save_processed_urls(conn, [url for url in load_processed_urls() if url])
+        os.remove(LEGACY_PROCESSED_PATH)
+        print(f"📦 Imported {LEGACY_PROCESSED_PATH} into {PROCESSED_DB_PATH}")
+    return conn
+
+
+def find_processed_digests(conn, digests):
+    """Return the subset of URL digests already recorded, using one indexed query"""
+    if not digests:
+        return set()
+    placeholders = ",".join("?" * len(digests))
+    rows = conn.execute(f"SELECT hash FROM urls WHERE hash IN ({placeholders})", digests)
+    return {row[0] for row in rows}
 
 
 def fetch_full_article(url):
@@ -78,15 +179,27 @@ def fetch_full_article(url):
         return None
 
 
-def save_processed_urls(urls):
-    with open("processed_urls.txt", "a") as f:
-        for url in urls:
-            f.write(url + "\n")
+def save_processed_urls(conn, urls):
+    """Record URLs as processed and drop entries older than PROCESSED_URL_TTL_DAYS"""
+    now = int(time.time())
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO urls (hash, ts) VALUES (?, ?)",
+            [(url_digest(url), now) for url in urls],
+        )
+        conn.execute(
+            "DELETE FROM urls WHERE ts < ?", (now - PROCESSED_URL_TTL_DAYS * 86400,)
+        )
 
+    # Freed pages are reused by later inserts; only rewrite the file once a large share sits idle
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    total_pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    if free_pages > total_pages * PROCESSED_DB_MAX_FREE_FRACTION:
+        conn.execute("VACUUM")
 
-def fetch_articles_by_keywords(keywords):
-    """Fetch news articles from News API for a given list of keywords"""
-    url = "https://newsapi.org/v2/everything"
+
+def build_news_query(keywords):
+    """Build the News API headers and query params for a list of keywords"""
     headers = {"X-Api-Key": NEWS_API_KEY}
     query = " OR ".join(keywords)
 
@@ -97,48 +210,210 @@ def fetch_articles_by_keywords(keywords):
         "pageSize": MAX_ARTICLES,
     }
 
-    print(f"📊 Fetching articles with keywords: {query}")
-    response = requests.get(url, headers=headers, params=params)
+    return headers, params
+
+
+def fetch_articles_by_keywords(keywords):
+    """Fetch news articles from News API for a given list of keywords"""
+    headers, params = build_news_query(keywords)
+    print(f"📊 Fetching articles with keywords: {params['q']}")
+    response = _SESSION.get(
+        NEWS_API_URL, headers=headers, params=params, timeout=NEWS_API_TIMEOUT
+    )
     if response.status_code != 200:
         raise Exception(f"News API Error: {response.status_code}, {response.text}")
 
-    data = response.json()
+    data = orjson.loads(response.content)
     return data.get("articles", [])
 
 
-def analyze_with_gemini(articles):
-    """Send articles to Gemini API for analysis using the official Google genai library"""
-    if not articles:
-        return "No articles found to analyze."
+async def _fetch_group(session, keywords):
+    """Async variant of fetch_articles_by_keywords sharing one aiohttp session"""
+    headers, params = build_news_query(keywords)
+    print(f"📊 Fetching articles with keywords: {params['q']}")
+
+    for attempt in range(NEWS_API_RETRIES + 1):
+        async with session.get(NEWS_API_URL, headers=headers, params=params) as response:
+            if response.status in RETRY_STATUSES and attempt < NEWS_API_RETRIES:
+                # Same policy as _SESSION: honour Retry-After, else exponential backoff
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else 0.5 * 2**attempt
+                await asyncio.sleep(delay)
+                continue
+            if response.status != 200:
+                raise Exception(f"News API Error: {response.status}, {await response.text()}")
+            data = orjson.loads(await response.read())
+            return data.get("articles", [])
+
+
+async def _gather_all():
+    timeout = aiohttp.ClientTimeout(total=NEWS_API_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        return await asyncio.gather(
+            *[_fetch_group(session, group) for group in KEYWORD_GROUPS]
+        )
+
+
+def fetch_all_keyword_groups():
+    """Fetch articles for every keyword group, returning one list per group in order"""
+    if USE_ASYNC_FETCH and aiohttp is not None:
+        return asyncio.run(_gather_all())
+    with ThreadPoolExecutor(max_workers=len(KEYWORD_GROUPS)) as executor:
+        return list(executor.map(fetch_articles_by_keywords, KEYWORD_GROUPS))
+
+
+def summarize_article(article):
+    """Flatten a News API article into the fields used for the prompt and saved report"""
+    return {
+        "title": article.get("title", ""),
+        "description": article.get("description", ""),
+        "source": article.get("source", {}).get("name", ""),
+        "url": article.get("url", ""),
+        "published": article.get("publishedAt", ""),
+        "image": article.get("urlToImage", ""),
+    }
+
 
+def format_articles_for_prompt(articles):
+    """Render enriched articles as compact numbered blocks, truncating each body"""
+    return "\n\n".join(
+        f"[{i}] {article['title']} | {article['source']} | {article['url']}\n"
+        f"{(article['content'] or article['description'] or '')[:MAX_CONTENT_CHARS]}"
+        for i, article in enumerate(articles, 1)
+    )
+
+
+def load_cached_analysis(key):
+    """Return a cached Gemini analysis for this prompt hash if it is still fresh"""
+    path = os.path.join(GEMINI_CACHE_DIR, f"{key}.md")
     try:
-        # Import the Google genai library
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        raise Exception(
-            "Google genai library not installed. Install it with: pip install google-generativeai"
+        if time.time() - os.path.getmtime(path) > GEMINI_CACHE_TTL:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def prune_analysis_cache():
+    """Delete cached analyses older than GEMINI_CACHE_TTL"""
+    cutoff = time.time() - GEMINI_CACHE_TTL
+    for entry in os.scandir(GEMINI_CACHE_DIR):
+        if entry.name.endswith(".md") and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+
+def save_cached_analysis(key, analysis):
+    """Write a Gemini analysis to the cache atomically (temp file + rename)"""
+    os.makedirs(GEMINI_CACHE_DIR, exist_ok=True)
+    prune_analysis_cache()
+    path = os.path.join(GEMINI_CACHE_DIR, f"{key}.md")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(analysis)
+    os.replace(tmp_path, path)
+
+
+def section_heading(line):
+    """Return the category a markdown heading line opens, or None"""
+    heading = line.strip().lower()
+    if heading.startswith("## ai"):
+        return "AI"
+    elif heading.startswith("## automation"):
+        return "Automation"
+    elif heading.startswith("## security"):
+        return "Security"
+    return None
+
+
+def split_sections(chunks):
+    """Yield (category, text) for each category block as soon as it is complete in a stream of text chunks.
+
+    A category heading that appears again opens a new block, so it is yielded (and sent) separately.
+    """
+    current_section = None
+    body = []
+    pending = ""
+
+    def lines():
+        nonlocal pending
+        for chunk in chunks:
+            pending += chunk
+            *complete, pending = pending.split("\n")
+            yield from complete
+        if pending:
+            yield pending
+
+    for line in lines():
+        category = section_heading(line)
+        if category:
+            if current_section:
+                yield current_section, "".join(body)
+            current_section, body = category, []
+        elif current_section:
+            body.append(line + "\n")
+
+    if current_section:
+        yield current_section, "".join(body)
+
+
+_genai_client = None
+
+
+def get_genai_client():
+    """Return a shared genai.Client, created on first use"""
+    global _genai_client
+    if _genai_client is None:
+        try:
+            # Import the Google genai library
+            from google import genai
+        except ImportError:
+            raise Exception(
+                "Google genai library not installed. Install it with: pip install google-generativeai"
+            )
+
+        _genai_client = genai.Client(api_key=GEMINI_API_KEY)
+    return _genai_client
+
+
+def stream_gemini_text(client, prompt, config, received):
+    """Yield Gemini response text chunks as they arrive, recording each in received"""
+    try:
+        stream = client.models.generate_content_stream(
+            model=GEMINI_MODEL,  # Using the configured model
+            contents=prompt,
+            config=config,
         )
+        for chunk in stream:
+            if chunk.text:
+                received.append(chunk.text)
+                yield chunk.text
+    except Exception as e:
+        raise Exception(f"Gemini API Error: {str(e)}")
+
+
+def analyze_with_gemini(articles, on_section=None):
+    """Send articles to Gemini API for analysis using the official Google genai library.
+
+    Each category block is passed to on_section(category, text) as soon as it has
+    finished streaming, so callers can forward it before the full response is done.
+    """
+    if not articles:
+        return "No articles found to analyze."
 
     # Prepare articles data for Gemini
     enriched_articles = []
 
     print("📰 Enriching articles with full content...")
 
-    for article in articles:
-        full_text = fetch_full_article(article["url"])
-        enriched_articles.append(
-            {
-                "title": article.get("title", ""),
-                "description": article.get("description", ""),
-                "source": article.get("source", {}).get("name", ""),
-                "url": article.get("url", ""),
-                "published": article.get("publishedAt", ""),
-                "image": article.get("urlToImage", ""),
-                "content": full_text or "",
-            }
+    with ThreadPoolExecutor(max_workers=FULL_ARTICLE_WORKERS) as executor:
+        full_texts = list(
+            executor.map(fetch_full_article, [article["url"] for article in articles])
         )
 
+    for article, full_text in zip(articles, full_texts):
+        enriched_articles.append({**article, "content": full_text or ""})
+
     # Create prompt for Gemini
     prompt = f"""
         You're a tech news analyst. Your job is to extract deep insights from a list of articles about AI, automation, and cybersecurity.
@@ -163,53 +438,50 @@ def analyze_with_gemini(articles):
         ## Security  
         ...
 
-        Here are the articles (with full content included):
+        Here are the articles, one per block as "[n] Title | Source | URL" followed by its content:
 
-        {json.dumps(articles, indent=2)}
+        {format_articles_for_prompt(enriched_articles)}
 
         Only output in markdown as per the structure above. Do not add anything else.
         """
 
-    print("🤖 Sending to Gemini API for analysis...")
+    cache_key = hashlib.blake2b(
+        f"{GEMINI_MODEL}\n{prompt}".encode(), digest_size=16
+    ).hexdigest()
+    analysis = load_cached_analysis(cache_key)
 
-    # Create a client instance
-    client = genai.Client(api_key=GEMINI_API_KEY)
+    received = []
 
-    # Set generation config
-    generation_config = types.GenerateContentConfig(
-        temperature=0.2, top_k=40, top_p=0.95, max_output_tokens=8192
-    )
+    if analysis is not None:
+        print("♻️ Using cached Gemini analysis")
+        text_chunks = [analysis]
+    else:
+        print("🤖 Sending to Gemini API for analysis...")
 
-    # Call Gemini API using the official client
-    try:
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,  # Using the configured model
-            contents=prompt,
-            config=generation_config,
+        # Reuse the shared client instance (also checks the genai library is installed)
+        client = get_genai_client()
+        from google.genai import types
+
+        # Set generation config
+        generation_config = types.GenerateContentConfig(
+            temperature=0.2, top_k=40, top_p=0.95, max_output_tokens=8192
         )
 
-        # Get the text from the response
-        analysis = response.text
-        print("✅ Analysis received from Gemini")
+        text_chunks = stream_gemini_text(client, prompt, generation_config, received)
 
-        # Split the markdown into category blocks
-        sections = {"AI": "", "Automation": "", "Security": ""}
-        current_section = None
+    # Split the markdown into category blocks while it streams
+    sections = {"AI": "", "Automation": "", "Security": ""}
 
-        for line in analysis.splitlines():
-            if line.strip().lower().startswith("## ai"):
-                current_section = "AI"
-            elif line.strip().lower().startswith("## automation"):
-                current_section = "Automation"
-            elif line.strip().lower().startswith("## security"):
-                current_section = "Security"
-            elif current_section:
-                sections[current_section] += line + "\n"
+    for category, text in split_sections(text_chunks):
+        sections[category] += text
+        if on_section:
+            on_section(category, text)
 
-        return sections
+    if analysis is None:
+        print("✅ Analysis received from Gemini")
+        save_cached_analysis(cache_key, "".join(received))
 
-    except Exception as e:
-        raise Exception(f"Gemini API Error: {str(e)}")
+    return sections
 
 
 def format_articles_basic(articles):
@@ -227,6 +499,38 @@ def format_articles_basic(articles):
     return "\n".join(lines)
 
 
+def _markdown_token_to_html(match):
+    """Render one _MARKDOWN_RE match as Telegram HTML"""
+    kind = match.lastgroup
+    if kind == "heading":
+        return f"<b>{markdown_to_html(match['heading'])}</b>"
+    if kind == "bold":
+        return f"<b>{markdown_to_html(match['bold'])}</b>"
+    if kind == "italic":
+        return f"<i>{markdown_to_html(match['italic'])}</i>"
+    return f'<a href="{match["href"]}">{markdown_to_html(match["text"])}</a>'
+
+
+def markdown_to_html(text):
+    """Convert markdown-ish Gemini output (headings, bold, italic, links) to Telegram HTML"""
+    return _MARKDOWN_RE.sub(_markdown_token_to_html, text)
+
+
+_last_telegram_post = 0.0
+
+
+def post_to_telegram(url, payload):
+    """POST to the Telegram API, only sleeping if the previous call was under TELEGRAM_MIN_INTERVAL ago"""
+    global _last_telegram_post
+    wait = TELEGRAM_MIN_INTERVAL - (time.monotonic() - _last_telegram_post)
+    if wait > 0:
+        time.sleep(wait)
+    try:
+        return _SESSION.post(url, data=payload)
+    finally:
+        _last_telegram_post = time.monotonic()
+
+
 def send_to_telegram(message, image_url=None):
     """Send message (and optionally an image) to Telegram using HTML formatting."""
     base_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
@@ -238,7 +542,7 @@ def send_to_telegram(message, image_url=None):
             "photo": image_url,
             "caption": "🖼️ Top Headline Image",
         }
-        photo_response = requests.post(f"{base_url}/sendPhoto", data=photo_payload)
+        photo_response = post_to_telegram(f"{base_url}/sendPhoto", photo_payload)
         if photo_response.status_code != 200:
             print(f"⚠️ Failed to send image: {photo_response.text}")
 
@@ -247,12 +551,7 @@ def send_to_telegram(message, image_url=None):
     header = f"🔍 <b>AI & TECH NEWS MARKET ANALYSIS</b>\n<code>{timestamp}</code>\n\n"
 
     # Convert markdown-ish Gemini output to HTML
-    content = message
-    content = re.sub(r"## (.*?)(\n|$)", r"<b>\1</b>\n", content)
-    content = re.sub(r"# (.*?)(\n|$)", r"<b>\1</b>\n", content)
-    content = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", content)
-    content = re.sub(r"_(.*?)_", r"<i>\1</i>", content)
-    content = re.sub(r"\[(.*?)\]\((.*?)\)", r'<a href="\2">\1</a>', content)
+    content = markdown_to_html(message)
 
     html_message = header + content
 
@@ -280,10 +579,45 @@ def send_to_telegram(message, image_url=None):
             "parse_mode": "HTML",
             "disable_web_page_preview": False,
         }
-        response = requests.post(f"{base_url}/sendMessage", data=payload)
+        response = post_to_telegram(f"{base_url}/sendMessage", payload)
         if response.status_code != 200:
             print(f"❌ Failed to send message part {i+1}: {response.text}")
-        time.sleep(1)
+
+
+def send_section_to_telegram(category, summary, articles):
+    """Send one category summary to Telegram, with the first matching article image"""
+    summary = summary.strip()
+    if not summary or "No major updates" in summary:
+        return
+
+    # Get first image from matching articles in that category
+    top_image = None
+    for article in articles:
+        if category.lower() in summary.lower() and article.get("urlToImage"):
+            top_image = article["urlToImage"]
+            break
+
+    send_to_telegram(summary, image_url=top_image)
+
+
+def telegram_section_worker(section_queue, articles, errors):
+    """Post queued (category, summary) sections to Telegram until a None sentinel arrives.
+
+    The first send failure is appended to errors and later sections are skipped (but
+    still drained, so the producer never blocks), matching the old abort-on-error flow.
+    """
+    while True:
+        item = section_queue.get()
+        if item is None:
+            return
+        if errors:
+            continue
+        category, summary = item
+        try:
+            send_section_to_telegram(category, summary, articles)
+        except Exception as e:
+            print(f"❌ Failed to send {category} analysis to Telegram: {str(e)}")
+            errors.append(e)
 
 
 def save_analysis(analysis, articles):
@@ -296,27 +630,16 @@ def save_analysis(analysis, articles):
         os.makedirs(directory)
 
     # Save the full analysis
-    with open(f"{directory}/analysis_{timestamp}.md", "w", encoding="utf-8") as f:
-        f.write("# AI, Automation and Cybersecurity News Analysis\n\n")
-        f.write(f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
-        f.write("## Analysis\n\n")
-        f.write(analysis)
-        f.write("\n\n## Raw Articles Data\n\n")
+    # Opened in binary so the orjson bytes are written directly, without a decoded copy
+    with open(f"{directory}/analysis_{timestamp}.md", "wb") as f:
+        f.write(b"# AI, Automation and Cybersecurity News Analysis\n\n")
         f.write(
-            json.dumps(
-                [
-                    {
-                        "title": article.get("title", ""),
-                        "description": article.get("description", ""),
-                        "source": article.get("source", {}).get("name", ""),
-                        "url": article.get("url", ""),
-                        "published": article.get("publishedAt", ""),
-                    }
-                    for article in articles
-                ],
-                indent=2,
-            )
+            f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n".encode()
         )
+        f.write(b"## Analysis\n\n")
+        f.write(analysis.encode("utf-8"))
+        f.write(b"\n\n## Raw Articles Data\n\n")
+        f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
 
     print(f"📄 Analysis saved to {directory}/analysis_{timestamp}.md")
 
@@ -329,19 +652,28 @@ def main():
         print("🔍 Starting news analysis process...")
 
         all_articles = []
-        seen_urls = set()
-        processed_urls = load_processed_urls()
+        seen_digests = set()
+        processed_db = open_processed_db()
+
+        article_groups = fetch_all_keyword_groups()
+        candidates = [
+            (url_digest(article["url"]), article)
+            for articles in article_groups
+            for article in articles
+            if article.get("url")
+        ]
+        processed_digests = find_processed_digests(
+            processed_db, list({digest for digest, _ in candidates})
+        )
 
-        for group in KEYWORD_GROUPS:
-            articles = fetch_articles_by_keywords(group)
-            for article in articles:
-                url = article.get("url")
-                if url and url not in seen_urls and url not in processed_urls:
-                    seen_urls.add(url)
-                    all_articles.append(article)
+        for digest, article in candidates:
+            if digest not in seen_digests and digest not in processed_digests:
+                seen_digests.add(digest)
+                all_articles.append(article)
 
         if not all_articles:
             print("❌ No new articles found.")
+            processed_db.close()
             return
 
         print(f"✅ Total unique articles collected: {len(all_articles)}")
@@ -349,27 +681,36 @@ def main():
         # Limit to MAX_ARTICLES total
         all_articles = all_articles[:MAX_ARTICLES]
 
-        analysis_sections = analyze_with_gemini(all_articles)
-        save_analysis("\n\n".join(analysis_sections.values()), all_articles)
+        articles_view = [summarize_article(article) for article in all_articles]
 
-        print("📤 Sending category-specific analysis to Telegram...")
+        print("📤 Sending category-specific analysis to Telegram as it streams...")
 
-        for category in ["AI", "Automation", "Security"]:
-            summary = analysis_sections.get(category, "").strip()
-            if not summary or "No major updates" in summary:
-                continue
+        # Telegram posting runs on its own thread so network I/O never stalls the Gemini stream
+        section_queue = queue.Queue(maxsize=3)  # One slot per category
+        send_errors = []
+        sender = threading.Thread(
+            target=telegram_section_worker,
+            args=(section_queue, all_articles, send_errors),
+            daemon=True,
+        )
+        sender.start()
+        try:
+            analysis_sections = analyze_with_gemini(
+                articles_view,
+                on_section=lambda category, text: section_queue.put((category, text)),
+            )
+        finally:
+            section_queue.put(None)
+            sender.join()
 
-            # Get first image from matching articles in that category
-            top_image = None
-            for article in all_articles:
-                title = article.get("title", "").lower()
-                if category.lower() in summary.lower() and article.get("urlToImage"):
-                    top_image = article["urlToImage"]
-                    break
+        save_analysis("\n\n".join(analysis_sections.values()), articles_view)
 
-            send_to_telegram(summary, image_url=top_image)
+        # Leave the articles unprocessed so the next run retries them
+        if send_errors:
+            raise send_errors[0]
 
-        save_processed_urls([article.get("url") for article in all_articles])
+        save_processed_urls(processed_db, [article.get("url") for article in all_articles])
+        processed_db.close()
         print("✅ Process completed successfully!")
 
     except Exception as e: